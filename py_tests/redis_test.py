@@ -1,19 +1,78 @@
 """
 Redis integration tests.
 Requires a running server on localhost:6379.
-Run with: pytest redis_test.py -v
+Run with: pytest redis_test.py -n auto -v
 """
 
+import itertools
+
 import pytest
 import redis
 
 
-@pytest.fixture(autouse=True)
-def r():
-    client = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
-    client.ping()
-    client.flushdb()
-    return client
+class NamespacedRedis(redis.Redis):
+    """Client that prefixes every key with `ns` and remembers the keys it touched."""
+
+    # Every command the suite sends must be listed here, so a new one can't
+    # slip keys past the namespace (and past cleanup) unnoticed.
+    KEYLESS_COMMANDS = {"PING"}
+    FIRST_KEY_COMMANDS = {
+        "SET", "GET", "INCR", "INCRBY", "TTL",
+        "RPUSH", "LPUSH", "LPOP", "RPOP", "LRANGE", "LLEN",
+        "HSET", "HGET", "HMGET", "HGETALL", "HINCRBY", "HEXISTS", "HKEYS",
+        "SADD", "SMEMBERS", "SISMEMBER", "SCARD",
+        "ZADD", "ZRANGE", "ZREVRANGE", "ZRANGEBYSCORE", "ZRANK", "ZREVRANK", "ZSCORE", "ZINCRBY", "ZCARD",
+    }
+    ALL_KEYS_COMMANDS = {"DEL", "EXISTS", "SINTER", "SUNION", "SDIFF"}
+
+    def __init__(self, ns, **kwargs):
+        super().__init__(**kwargs)
+        self.ns = ns
+        self.touched = set()
+
+    def execute_command(self, *args, **options):
+        name, *rest = args
+        command = name.upper()
+        if command in self.KEYLESS_COMMANDS:
+            n = 0
+        elif command in self.FIRST_KEY_COMMANDS:
+            n = 1
+        elif command in self.ALL_KEYS_COMMANDS:
+            n = len(rest)
+        else:
+            raise ValueError(f"{command} has no key positions in NamespacedRedis; classify it first")
+        keys = [f"{self.ns}{key}" for key in rest[:n]]
+        self.touched.update(keys)
+        return super().execute_command(name, *keys, *rest[n:], **options)
+
+    def cleanup(self):
+        if self.touched:
+            super().execute_command("DEL", *self.touched)
+            self.touched.clear()
+
+
+def hset_mapping(r, key, mapping):
+    """Write `mapping` with one variadic HSET, whatever the redis-py version."""
+    return r.execute_command("HSET", key, *itertools.chain.from_iterable(mapping.items()))
+
+
+@pytest.fixture(scope="session")
+def pool():
+    pool = redis.ConnectionPool(host="localhost", port=6379, db=0, max_connections=16)
+    yield pool
+    pool.disconnect()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _health(pool):
+    redis.Redis(connection_pool=pool).ping()
+
+
+@pytest.fixture
+def r(request, pool):
+    client = NamespacedRedis(f"t:{request.node.name}:", connection_pool=pool)
+    yield client
+    client.cleanup()
 
 
 # ── Strings ───────────────────────────────────────────────────────────────────
@@ -21,21 +80,19 @@ def r():
 class TestStrings:
     def test_set_and_get(self, r):
         r.set("key", "Alice")
-        assert r.get("key") == "Alice"
+        assert r.get("key") == b"Alice"
 
     def test_get_missing_key(self, r):
         assert r.get("missing") is None
 
     def test_incr(self, r):
         r.set("counter", 0)
-        r.incr("counter")
-        r.incr("counter")
-        assert r.get("counter") == "2"
+        assert r.incr("counter") == 1
+        assert r.incr("counter") == 2
 
     def test_incrby(self, r):
         r.set("counter", 2)
-        r.incrby("counter", 8)
-        assert r.get("counter") == "10"
+        assert r.incrby("counter", 8) == 10
 
     def test_set_with_ex(self, r):
         r.set("temp", "bye", ex=5)
@@ -44,7 +101,7 @@ class TestStrings:
     def test_set_nx(self, r):
         r.set("nx", "first", nx=True)
         r.set("nx", "second", nx=True)
-        assert r.get("nx") == "first"
+        assert r.get("nx") == b"first"
 
 
 # ── Lists ─────────────────────────────────────────────────────────────────────
@@ -53,22 +110,22 @@ class TestLists:
     def test_rpush_and_lrange(self, r):
         r.rpush("q:test_rpush_and_lrange", "a", "b", "c")
         assert r.llen("q:test_rpush_and_lrange") == 3
-        assert r.lrange("q:test_rpush_and_lrange", 0, -1) == ["a", "b", "c"]
+        assert r.lrange("q:test_rpush_and_lrange", 0, -1) == [b"a", b"b", b"c"]
 
     def test_lpush(self, r):
         r.rpush("q:test_lpush", "a", "b")
         r.lpush("q:test_lpush", "z")
-        assert r.lrange("q:test_lpush", 0, -1) == ["z", "a", "b"]
+        assert r.lrange("q:test_lpush", 0, -1) == [b"z", b"a", b"b"]
 
     def test_lpop(self, r):
         assert r.rpush("q:test_lpop", "a", "b", "c") == 3
-        assert r.lpop("q:test_lpop") == "a"
-        assert r.lrange("q:test_lpop", 0, -1) == ["b", "c"]
+        assert r.lpop("q:test_lpop") == b"a"
+        assert r.lrange("q:test_lpop", 0, -1) == [b"b", b"c"]
 
     def test_rpop(self, r):
         r.rpush("q:test_rpop", "a", "b", "c")
-        assert r.rpop("q:test_rpop") == "c"
-        assert r.lrange("q:test_rpop", 0, -1) == ["a", "b"]
+        assert r.rpop("q:test_rpop") == b"c"
+        assert r.lrange("q:test_rpop", 0, -1) == [b"a", b"b"]
 
     def test_llen(self, r):
         r.rpush("q:test_llen", "a", "b", "c")
@@ -80,25 +137,27 @@ class TestLists:
 class TestHashes:
     def test_hset_and_hget(self, r):
         r.hset("h:test_hset_and_hget", "name", "Alice")
-        assert r.hget("h:test_hset_and_hget", "name") == "Alice"
+        assert r.hget("h:test_hset_and_hget", "name") == b"Alice"
 
     def test_hset_mapping_and_hgetall(self, r):
-        r.hset("h:test_hset_mapping_and_hgetall", mapping={"name": "Alice", "email": "a@b.com", "age": "30"})
-        assert r.hgetall("h:test_hset_mapping_and_hgetall") == {"name": "Alice", "email": "a@b.com", "age": "30"}
+        hset_mapping(r, "h:test_hset_mapping_and_hgetall", {"name": "Alice", "email": "a@b.com", "age": "30"})
+        assert r.hmget("h:test_hset_mapping_and_hgetall", "name", "email", "age") == [b"Alice", b"a@b.com", b"30"]
+
+    def test_hgetall_small(self, r):
+        hset_mapping(r, "h:test_hgetall_small", {"a": "1", "b": "2"})
+        assert r.hgetall("h:test_hgetall_small") == {b"a": b"1", b"b": b"2"}
 
     def test_hmget(self, r):
-        r.hset("h:test_hmget", mapping={"a": "1", "b": "2", "c": "3"})
-        assert r.hmget("h:test_hmget", "a", "c") == ["1", "3"]
+        hset_mapping(r, "h:test_hmget", {"a": "1", "b": "2", "c": "3"})
+        assert r.hmget("h:test_hmget", "a", "c") == [b"1", b"3"]
 
     def test_hincrby(self, r):
         r.hset("h:test_hincrby", "score", "100")
-        r.hincrby("h:test_hincrby", "score", 50)
-        assert r.hget("h:test_hincrby", "score") == "150"
+        assert r.hincrby("h:test_hincrby", "score", 50) == 150
 
     def test_hincrby_missing_field(self, r):
         r.hset("h:test_hincrby_missing_field", "other", "x")
-        r.hincrby("h:test_hincrby_missing_field", "score", 10)
-        assert r.hget("h:test_hincrby_missing_field", "score") == "10"
+        assert r.hincrby("h:test_hincrby_missing_field", "score", 10) == 10
 
     def test_hexists(self, r):
         r.hset("h:test_hexists", "name", "Alice")
@@ -106,8 +165,8 @@ class TestHashes:
         assert r.hexists("h:test_hexists", "missing") is False
 
     def test_hkeys(self, r):
-        r.hset("h:test_hkeys", mapping={"a": "1", "b": "2", "c": "3"})
-        assert set(r.hkeys("h:test_hkeys")) == {"a", "b", "c"}
+        hset_mapping(r, "h:test_hkeys", {"a": "1", "b": "2", "c": "3"})
+        assert set(r.hkeys("h:test_hkeys")) == {b"a", b"b", b"c"}
 
 
 # ── Sets ──────────────────────────────────────────────────────────────────────
@@ -115,27 +174,27 @@ class TestHashes:
 class TestSets:
     def test_sadd_and_smembers(self, r):
         r.sadd("s:test_sadd_and_smembers", "Alice", "Bob", "Carol")
-        assert r.smembers("s:test_sadd_and_smembers") == {"Alice", "Bob", "Carol"}
+        assert r.smembers("s:test_sadd_and_smembers") == {b"Alice", b"Bob", b"Carol"}
 
     def test_sismember(self, r):
         r.sadd("s:test_sadd_and_smembers", "Alice", "Bob")
-        assert r.sismember("s:test_sadd_and_smembers", "Alice") is 1
-        assert r.sismember("s:test_sadd_and_smembers", "Dave") is 0
+        assert r.sismember("s:test_sadd_and_smembers", "Alice") == 1
+        assert r.sismember("s:test_sadd_and_smembers", "Dave") == 0
 
     def test_sinter(self, r):
         r.sadd("a:test_sinter", "Alice", "Bob", "Carol")
         r.sadd("b:test_sinter", "Bob", "Dave")
-        assert r.sinter("a:test_sinter", "b:test_sinter") == {"Bob"}
+        assert r.sinter("a:test_sinter", "b:test_sinter") == {b"Bob"}
 
     def test_sunion(self, r):
         r.sadd("a:test_sunion", "Alice", "Bob")
         r.sadd("b:test_sunion", "Bob", "Carol")
-        assert r.sunion("a:test_sunion", "b:test_sunion") == {"Alice", "Bob", "Carol"}
+        assert r.sunion("a:test_sunion", "b:test_sunion") == {b"Alice", b"Bob", b"Carol"}
 
     def test_sdiff(self, r):
         r.sadd("a:test_sdiff", "Alice", "Bob", "Carol")
         r.sadd("b:test_sdiff", "Bob", "Dave")
-        assert r.sdiff("a:test_sdiff", "b:test_sdiff") == {"Alice", "Carol"}
+        assert r.sdiff("a:test_sdiff", "b:test_sdiff") == {b"Alice", b"Carol"}
 
     def test_scard(self, r):
         r.sadd("s:test_scard", "Alice", "Bob", "Carol")
@@ -148,17 +207,17 @@ class TestSortedSets:
     def test_zadd_and_zrange(self, r):
         r.zadd("z:test_zadd_and_zrange", {"Alice": 900, "Bob": 750, "Carol": 870, "Dave": 600})
         assert r.zrange("z:test_zadd_and_zrange", 0, -1, withscores=True) == [
-            ("Dave", 600.0), ("Bob", 750.0), ("Carol", 870.0), ("Alice", 900.0),
+            (b"Dave", 600.0), (b"Bob", 750.0), (b"Carol", 870.0), (b"Alice", 900.0),
         ]
 
     def test_zrange_without_scores(self, r):
         r.zadd("z:test_zrange_without_scores", {"Alice": 900, "Bob": 750, "Carol": 870})
-        assert r.zrange("z:test_zrange_without_scores", 0, -1) == ["Bob", "Carol", "Alice"]
+        assert r.zrange("z:test_zrange_without_scores", 0, -1) == [b"Bob", b"Carol", b"Alice"]
 
     def test_zrevrange(self, r):
         r.zadd("z:test_zrevrange", {"Alice": 900, "Bob": 750, "Carol": 870})
         assert r.zrange("z:test_zrevrange", 0, -1, withscores=True, desc=True) == [
-            ("Alice", 900.0), ("Carol", 870.0), ("Bob", 750.0),
+            (b"Alice", 900.0), (b"Carol", 870.0), (b"Bob", 750.0),
         ]
 
     def test_zrank(self, r):
@@ -179,13 +238,12 @@ class TestSortedSets:
     def test_zrangebyscore(self, r):
         r.zadd("z:test_zrangebyscore", {"Alice": 900, "Bob": 750, "Carol": 870, "Dave": 600})
         assert r.zrangebyscore("z:test_zrangebyscore", 700, 900, withscores=True) == [
-            ("Bob", 750.0), ("Carol", 870.0), ("Alice", 900.0),
+            (b"Bob", 750.0), (b"Carol", 870.0), (b"Alice", 900.0),
         ]
 
     def test_zincrby(self, r):
         r.zadd("z:test_zincrby", {"Dave": 600})
-        r.zincrby("z:test_zincrby", 200, "Dave")
-        assert r.zscore("z:test_zincrby", "Dave") == 800.0
+        assert r.zincrby("z:test_zincrby", 200, "Dave") == 800.0
 
     def test_zadd_updates_existing(self, r):
         r.zadd("z:test_zadd_updates_existing", {"Alice": 100})
@@ -205,6 +263,5 @@ class TestKeyUtilities:
     def test_del(self, r):
         r.set("a", "1")
         r.set("b", "2")
-        r.delete("a", "b")
-        assert r.get("a") is None
-        assert r.get("b") is None
+        assert r.delete("a", "b") == 2
+        assert r.delete("a", "b") == 0